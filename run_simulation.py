@@ -1,12 +1,44 @@
-
+import argparse
 import pandas as pd
-from src.data_bootloader import load_nba_team_factors# Load player stats
-df = pd.read_csv("player_stats.csv")
-
-# === Load NBA team factors (CraftedNBA feed) ===
-team_factors = load_nba_team_factors(base_dir="./data", max_age_days=3)
-print(f"✅ Loaded {len(team_factors)} NBA team factor rows.")
-print(team_factors.head())# Show top 5 players by xwOBA
-top_hitters = df.sort_values("xwOBA", ascending=False).head()
-print("Top Hitters by xwOBA:")
-print(top_hitters)
+
+PLAYER_COLUMNS = ["player_name", "team", "xwOBA"]
+
+def read_player_stats(path: str = "player_stats.csv") -> pd.DataFrame:
+    # memory-map the file and parse it with pyarrow; plain read_csv(memory_map=True) without pyarrow
+    try:
+        import pyarrow as pa, pyarrow.csv as pacsv
+    except ImportError:
+        return pd.read_csv(path, usecols=PLAYER_COLUMNS, memory_map=True,
+                           dtype={"player_name": "str", "team": "str", "xwOBA": "float32"})
+    table = pacsv.read_csv(
+        pa.memory_map(path),
+        convert_options=pacsv.ConvertOptions(include_columns=PLAYER_COLUMNS, column_types={"xwOBA": pa.float32()}),
+    )
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+def load_nba(base_dir: str = "./data", max_age_days: int = 3) -> pd.DataFrame:
+    # imported here so the MLB-only path never touches the NBA loader
+    from src.src.data_bootloader import load_nba_team_factors
+    return load_nba_team_factors(base_dir=base_dir, max_age_days=max_age_days)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--with-nba", action="store_true", help="also load NBA team factors (CraftedNBA feed)")
+    args = ap.parse_args()
+
+    # Load player stats
+    df = read_player_stats("player_stats.csv")
+
+    # === Load NBA team factors (CraftedNBA feed) ===
+    if args.with_nba:
+        team_factors = load_nba()
+        print(f"✅ Loaded {len(team_factors)} NBA team factor rows.")
+        print(team_factors.head())
+
+    # Show top 5 players by xwOBA
+    top_hitters = df.nlargest(5, "xwOBA")
+    print("Top Hitters by xwOBA:")
+    print(top_hitters)
+
+if __name__ == "__main__":
+    main()
@@ -9,12 +9,15 @@ Usage:
   python import_craftednba.py --input data/raw/craftednba_four_factors_YYYYMMDD.csv --date 2025-11-05 --outdir ./data
 
 Outputs (in --outdir):
-  processed/nba_team_factors_current.csv
+  processed/nba_team_factors_current.parquet   (zstd; what the loader reads; needs pyarrow)
+  processed/nba_team_factors_YYYYMMDD.parquet  (zstd; needs pyarrow)
+  processed/nba_team_factors_current.csv       (human-readable export)
   processed/nba_team_factors_YYYYMMDD.csv
   processed/nba_team_factors_YYYYMMDD.json
 """
 
-import argparse, os, sys, json, datetime
+import argparse, os, sys, json, datetime, functools
+import numpy as np
 import pandas as pd
 
 TEAM_ABBR = {
@@ -37,114 +40,232 @@ ALIASES = {
     "NetRTG": ["NetRTG", "Net Rtg", "Net Rating", "Net"],
     "Off_eFG": ["EFG%", "eFG%", "Off eFG%", "EFG_off", "EFG_offense", "Offense eFG%"],
     "Off_ORB": ["ORB%", "Off ORB%", "ORB_off", "ORB% (Off)"],
-    "Off_FTAr": ["FTAr", "FTA Rate", "FT Rate (Off)"],
-    "Off_TOV": ["TO%", "TOV%", "TOV_off", "TO% (Off)", "Turnover%"],
+    "Off_FTAr": ["FTAr", "FTA Rate", "FT Rate (Off)", "Off FTAr"],
+    "Off_TOV": ["TO%", "TOV%", "TOV_off", "TO% (Off)", "Turnover%", "Off TOV%"],
     "Def_eFG": ["EFG% (Def)", "Def eFG%", "eFG%_def", "eFG% Allowed"],
     "Def_ORB": ["ORB% (Def)", "Def ORB%", "Opp ORB%", "ORB%_def"],
     "Def_FTAr": ["FTAr (Def)", "Def FTAr", "Opp FTAr", "FT Rate (Def)"],
     "Def_TOV": ["TO% (Def)", "Def TOV%", "TOV%_def", "Opp TOV% Forced"]
 }
 
-def find_column(df, aliases):
-    for a in aliases:
-        if a in df.columns:
-            return a
-        for col in df.columns:
-            if col.strip().lower() == a.strip().lower():
-                return col
-    return None
-
-def pct_to_float(x):
-    """Convert percent strings/numbers to 0–1 floats."""
-    if pd.isna(x): return None
-    if isinstance(x, str):
-        s = x.strip().replace('%', '')
-        if s == '': return None
-        try: val = float(s)
-        except: return None
-    else:
-        val = float(x)
-    if 0 <= val <= 1.5: return val
-    return val / 100.0
-
-def ratio_to_float(x):
-    """Normalize FTAr as a ratio (not percent)."""
-    if pd.isna(x): return None
-    if isinstance(x, str):
-        s = x.strip().replace('%', '')
-        if s == '': return None
-        try: val = float(s)
-        except: return None
-    else:
-        val = float(x)
-    if val > 1.5: return val / 100.0
-    return val
+# Aliases pre-normalized once at import
+_ALIAS_LC = tuple((canon, tuple(a.strip().lower() for a in aliases)) for canon, aliases in ALIASES.items())
+
+# Header of the standard CraftedNBA export (see config/data/raw/craftednba_four_factors_template.csv)
+CRAFTEDNBA_HEADER = (
+    "Team", "ORTG", "DRTG", "NetRTG", "Off eFG%", "Off ORB%", "Off FTAr", "Off TOV%",
+    "Def EFG%", "Def ORB%", "Def FTAr", "Def TOV%",
+)
+
+def column_index(df) -> dict:
+    """Map normalized (stripped, lower-cased) header -> original column name."""
+    return {c.strip().lower(): c for c in df.columns}
 
-def load_and_normalize(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
+def resolve_layout(header_lc) -> dict:
+    """Resolve each canonical field to a normalized header name (None for a missing NetRTG)."""
     cols = {}
-    for canon, alias_list in ALIASES.items():
-        col = find_column(df, alias_list)
+    for canon, aliases_lc in _ALIAS_LC:
+        col = next((a for a in aliases_lc if a in header_lc), None)
         if col is None and canon == "NetRTG":
             pass
         elif col is None:
-            raise ValueError(f"Missing required column for {canon}. Acceptable aliases: {alias_list}")
+            raise ValueError(f"Missing required column for {canon}. Acceptable aliases: {ALIASES[canon]}")
         cols[canon] = col
+    return cols
+
+# Normalized header set -> resolved layout; known exports skip alias scanning entirely
+_KNOWN_LAYOUTS = {
+    frozenset(h.strip().lower() for h in header): resolve_layout({h.strip().lower() for h in header})
+    for header in (CRAFTEDNBA_HEADER,)
+}
+
+def _to_number(s: pd.Series) -> np.ndarray:
+    """Parse a column of percent strings/numbers to float64 (NaN when unparseable)."""
+    # numeric columns need no parsing; text columns go through the .str accessor in bulk
+    if pd.api.types.is_numeric_dtype(s):
+        return s.to_numpy(dtype="float64", na_value=np.nan)
+    text = s.astype(str).str.replace('%', '', regex=False).str.strip()
+    return pd.to_numeric(text, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+def _norm_block_np(raw: np.ndarray, n_pct: int) -> np.ndarray:
+    """Scale and clip the raw four-factor block; first n_pct columns are percents, the rest FTAr ratios."""
+    pct, ftar = raw[:, :n_pct], raw[:, n_pct:]
+    out = np.empty(raw.shape, dtype=np.float32)
+    out[:, :n_pct] = np.clip(np.where((pct >= 0) & (pct <= 1.5), pct, pct / 100.0), 0.0, 1.0)
+    out[:, n_pct:] = np.clip(np.where(ftar > 1.5, ftar / 100.0, ftar), 0.0, 1.5)
+    return out
+
+def _norm_block_loop(raw, n_pct):
+    # same as _norm_block_np, fused into a single pass over the block; compiled by _jit_norm_block
+    out = np.empty(raw.shape, dtype=np.float32)
+    for i in range(raw.shape[0]):
+        for j in range(raw.shape[1]):
+            v = raw[i, j]
+            if j < n_pct:
+                if not (0.0 <= v <= 1.5):
+                    v /= 100.0
+                upper = 1.0
+            else:
+                if v > 1.5:
+                    v /= 100.0
+                upper = 1.5
+            # NaN fails both comparisons and passes through
+            out[i, j] = 0.0 if v < 0.0 else (upper if v > upper else v)
+    return out
+
+# Importing numba and loading the cached kernel costs ~0.3 s once, against ~0.11 ms saved
+# per 1000 rows, so the jitted path only pays off on multi-million-row blocks
+NUMBA_MIN_ROWS = 3_000_000
+
+@functools.lru_cache(maxsize=None)
+def _jit_norm_block():
+    """The numba-compiled _norm_block_loop, or None when numba isn't installed."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_norm_block_loop)
 
-    out = pd.DataFrame()
-    out["team_name"] = df[cols.get("team", "team")]
-    out["team"] = out["team_name"].map(TEAM_ABBR).fillna(out["team_name"])
-    out["ortg"] = pd.to_numeric(df[cols["ORTG"]], errors="coerce")
-    out["drtg"] = pd.to_numeric(df[cols["DRTG"]], errors="coerce")
+def _norm_block(raw: np.ndarray, n_pct: int) -> np.ndarray:
+    if raw.shape[0] >= NUMBA_MIN_ROWS:
+        kernel = _jit_norm_block()
+        if kernel is not None:
+            return kernel(raw, n_pct)
+    return _norm_block_np(raw, n_pct)
+
+# Output column -> ALIASES key, grouped by clip bound
+PCT_COLS = {"off_efg": "Off_eFG", "def_efg": "Def_eFG", "off_orb": "Off_ORB",
+            "def_orb": "Def_ORB", "off_tov": "Off_TOV", "def_tov": "Def_TOV"}
+FTAR_COLS = {"off_ftar": "Off_FTAr", "def_ftar": "Def_FTAr"}
+
+def _json_value(v):
+    # stdlib-json fallback: missing -> null, and float32 -> float via its shortest repr so the
+    # digits match what orjson prints (0.567, not 0.5669999718666077)
+    if pd.isna(v):
+        return None
+    if isinstance(v, np.floating):
+        return float(str(v))
+    return v
+
+def write_json_records(df: pd.DataFrame, path: str) -> None:
+    """Dump df as a JSON list of records via orjson (C serializer), falling back to the json module."""
+    # zip the column arrays rather than to_dict so float32 values stay numpy scalars and
+    # orjson prints them at float32 precision (0.567, not 0.5669999718666077)
+    columns = list(df.columns)
+    records = [dict(zip(columns, row)) for row in zip(*(df[c].to_numpy() for c in columns))]
+    try:
+        import orjson
+    except ImportError:
+        records = [{k: _json_value(v) for k, v in rec.items()} for rec in records]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, separators=(",", ":"))
+        return
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(records, option=orjson.OPT_SERIALIZE_NUMPY))
+
+def load_and_normalize(path: str, chunksize: int | None = None) -> pd.DataFrame:
+    """Read a CraftedNBA export and normalize it; pass chunksize to bound peak memory on large files."""
+    col_index = column_index(pd.read_csv(path, nrows=0))
+    layout = _KNOWN_LAYOUTS.get(frozenset(col_index)) or resolve_layout(col_index)
+    cols = {canon: (col_index[lc] if lc else None) for canon, lc in layout.items()}
+
+    # Only the team name is typed up front. Ratings and four factors keep the parser's inferred
+    # dtype: plain numbers parse natively, and '%' or stray "—" cells arrive as text that
+    # _normalize_frame coerces to NaN instead of failing the read
+    usecols = list(dict.fromkeys(c for c in cols.values() if c is not None))
+    dtype = {cols["team"]: "str"}
+    if not chunksize:
+        return _normalize_frame(pd.read_csv(path, usecols=usecols, dtype=dtype), cols)
+
+    reader = pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
+    out = pd.concat([_normalize_frame(chunk, cols) for chunk in reader], ignore_index=True)
+    out["team"] = out["team"].astype("category")  # chunks carry their own categories
+    return out
+
+def _normalize_frame(df: pd.DataFrame, cols: dict) -> pd.DataFrame:
+    team_name = df[cols.get("team", "team")]
+    # map the distinct names once (not per row); unknown names pass through unchanged.
+    # Categorical.map keeps the full-name order, so re-sort the categories by abbreviation
+    team = team_name.astype("category").map(lambda n: TEAM_ABBR.get(n, n)).astype("category")
+    team = team.cat.reorder_categories(sorted(team.cat.categories))
+    ortg = pd.to_numeric(df[cols["ORTG"]], errors="coerce", downcast="float").to_numpy()
+    drtg = pd.to_numeric(df[cols["DRTG"]], errors="coerce", downcast="float").to_numpy()
     if cols.get("NetRTG"):
-        out["netrtg"] = pd.to_numeric(df[cols["NetRTG"]], errors="coerce")
+        netrtg = pd.to_numeric(df[cols["NetRTG"]], errors="coerce", downcast="float").to_numpy()
     else:
-        out["netrtg"] = out["ortg"] - out["drtg"]
-
-    # Normalize four factors
-    out["off_efg"]  = df[cols["Off_eFG"]].apply(pct_to_float)
-    out["off_orb"]  = df[cols["Off_ORB"]].apply(pct_to_float)
-    out["off_tov"]  = df[cols["Off_TOV"]].apply(pct_to_float)
-    out["off_ftar"] = df[cols["Off_FTAr"]].apply(ratio_to_float)
-    out["def_efg"]  = df[cols["Def_eFG"]].apply(pct_to_float)
-    out["def_orb"]  = df[cols["Def_ORB"]].apply(pct_to_float)
-    out["def_tov"]  = df[cols["Def_TOV"]].apply(pct_to_float)
-    out["def_ftar"] = df[cols["Def_FTAr"]].apply(ratio_to_float)
-
-    # Bound values
-    for c in ["off_efg","def_efg","off_orb","def_orb","off_tov","def_tov"]:
-        out[c] = out[c].clip(lower=0, upper=1)
-    for c in ["off_ftar","def_ftar"]:
-        out[c] = out[c].clip(lower=0, upper=1.5)
-
-    out["source"] = "CraftedNBA"
-    return out
+        netrtg = ortg - drtg
+
+    # Normalize + bound all eight four-factor columns in one pass (stored as float32)
+    raw = np.column_stack([_to_number(df[cols[c]]) for c in (*PCT_COLS.values(), *FTAR_COLS.values())])
+    block = _norm_block(raw, len(PCT_COLS))
+    factors = dict(zip((*PCT_COLS, *FTAR_COLS), block.T))
+
+    # Build in one go rather than column-by-column assignment
+    return pd.DataFrame({
+        "team_name": team_name,
+        "team": team,
+        "ortg": ortg,
+        "drtg": drtg,
+        "netrtg": netrtg,
+        "off_efg": factors["off_efg"],
+        "off_orb": factors["off_orb"],
+        "off_tov": factors["off_tov"],
+        "off_ftar": factors["off_ftar"],
+        "def_efg": factors["def_efg"],
+        "def_orb": factors["def_orb"],
+        "def_tov": factors["def_tov"],
+        "def_ftar": factors["def_ftar"],
+        "source": "CraftedNBA",
+    })
+
+def sort_by_team(df: pd.DataFrame) -> pd.DataFrame:
+    """Order rows by team abbreviation, missing teams last (as sort_values would)."""
+    # _normalize_frame (and the chunked concat) give team sorted categories, so an
+    # integer sort on the codes orders by team without string comparisons
+    codes = df["team"].cat.codes.to_numpy()
+    codes = np.where(codes < 0, len(df["team"].cat.categories), codes)
+    return df.iloc[np.argsort(codes, kind="stable")].reset_index(drop=True)
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True)
     ap.add_argument("--date", default=datetime.date.today().isoformat())
     ap.add_argument("--outdir", default="./data")
+    ap.add_argument("--chunksize", type=int, default=None, help="read the input in batches of N rows")
     args = ap.parse_args()
 
-    df = load_and_normalize(args.input)
+    df = load_and_normalize(args.input, chunksize=args.chunksize)
 
     proc_dir = os.path.join(args.outdir, "processed")
     os.makedirs(proc_dir, exist_ok=True)
 
     stamp = args.date.replace("-", "")
+    pq_current = os.path.join(proc_dir, "nba_team_factors_current.parquet")
+    pq_snapshot = os.path.join(proc_dir, f"nba_team_factors_{stamp}.parquet")
     csv_current = os.path.join(proc_dir, "nba_team_factors_current.csv")
     csv_snapshot = os.path.join(proc_dir, f"nba_team_factors_{stamp}.csv")
     json_snapshot = os.path.join(proc_dir, f"nba_team_factors_{stamp}.json")
 
-    df_out = df.sort_values("team").reset_index(drop=True)
+    df_out = sort_by_team(df)
+    wrote = []
+    try:
+        df_out.to_parquet(pq_current, compression="zstd", index=False)
+        df_out.to_parquet(pq_snapshot, compression="zstd", index=False)
+        wrote += [pq_current, pq_snapshot]
+    except ImportError:
+        # Parquet is optional (needs pyarrow); drop any older current.parquet so the
+        # loader doesn't prefer it over the CSV written below
+        print("[WARN] No parquet engine (pyarrow) installed; writing CSV/JSON only.")
+        if os.path.exists(pq_current):
+            os.remove(pq_current)
     df_out.to_csv(csv_current, index=False)
     df_out.to_csv(csv_snapshot, index=False)
-    df_out.to_json(json_snapshot, orient="records", indent=2)
+    write_json_records(df_out, json_snapshot)
+    wrote += [csv_current, csv_snapshot, json_snapshot]
 
     print(f"[OK] CraftedNBA import complete for {args.date}")
     print(f"Rows: {len(df_out)} | Sample teams: {', '.join(df_out['team'].head(5))}")
-    print(f"Wrote:\n  - {csv_current}\n  - {csv_snapshot}\n  - {json_snapshot}")
+    print("Wrote:\n" + "\n".join(f"  - {p}" for p in wrote))
 
 if __name__ == "__main__":
     main()
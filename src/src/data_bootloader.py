@@ -1,43 +1,135 @@
 # src/data_bootloader.py
 from __future__ import annotations
-import os, glob, datetime as dt
+import os, glob, zlib, functools, importlib.util, datetime as dt
 import pandas as pd
 
 class StaleDataWarning(UserWarning):
     pass
 
+@functools.lru_cache(maxsize=None)
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+def _formats() -> tuple[str, ...]:
+    # Parquet needs an engine (pyarrow/fastparquet); without one only the CSV outputs are usable
+    if _has_module("pyarrow") or _has_module("fastparquet"):
+        return ("parquet", "csv")
+    return ("csv",)
+
+def _read_parquet(path: str) -> pd.DataFrame:
+    # memory_map is a pyarrow option; fastparquet's to_pandas rejects it with TypeError
+    if _has_module("pyarrow"):
+        return pd.read_parquet(path, engine="pyarrow", memory_map=True)
+    return pd.read_parquet(path)
+
+def _snapshot_stamp(path: str, prefix="nba_team_factors_") -> str:
+    return os.path.basename(path).removeprefix(prefix).split(".", 1)[0]  # YYYYMMDD
+
 def _latest_snapshot(proc_dir: str, prefix="nba_team_factors_") -> str | None:
-    paths = sorted(glob.glob(os.path.join(proc_dir, f"{prefix}[0-9]*.csv")))
-    return paths[-1] if paths else None
+    # newest YYYYMMDD stamp across all usable formats (stamps sort lexicographically);
+    # Parquet only wins a tie, so a later CSV-only import isn't shadowed by an older Parquet
+    rank = {ext: i for i, ext in enumerate(_formats())}
+    # "[0-9]." keeps the loader's own "<name>.csv.parquet" caches out of the match
+    paths = (p for ext in rank for p in glob.iglob(os.path.join(proc_dir, f"{prefix}[0-9]*[0-9].{ext}")))
+    return max(paths, key=lambda p: (_snapshot_stamp(p, prefix), -rank[p.rsplit(".", 1)[1]]), default=None)
+
+def _age_days(stamp: str) -> int:
+    y, rem = divmod(int(stamp), 10000)
+    m, d = divmod(rem, 100)
+    return (dt.date.today() - dt.date(y, m, d)).days
+
+FACTOR_DTYPES = {
+    "team_name": "str", "team": "category", "source": "str",
+    "ortg": "float32", "drtg": "float32", "netrtg": "float32",
+    "off_efg": "float32", "off_orb": "float32", "off_tov": "float32", "off_ftar": "float32",
+    "def_efg": "float32", "def_orb": "float32", "def_tov": "float32", "def_ftar": "float32",
+}
+
+REQUIRED_COLUMNS = {
+    "team","ortg","drtg","netrtg",
+    "off_efg","off_orb","off_tov","off_ftar",
+    "def_efg","def_orb","def_tov","def_ftar"
+}
+
+def _check_schema(df: pd.DataFrame) -> None:
+    # minimal schema assertion (case-insensitive)
+    have = {c.lower() for c in df.columns}
+    missing = REQUIRED_COLUMNS - have
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+@functools.lru_cache(maxsize=16)
+def _fingerprint(path: str, stat_key: tuple[int, int, int]) -> tuple[int, int]:
+    # (size, CRC-32) of the file contents, memoized per (st_mtime_ns, st_size, st_ino) so an
+    # untouched file isn't re-hashed while a resized or replaced file (cp -p, rsync -t) is
+    size, crc = 0, 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            size += len(block)
+            crc = zlib.crc32(block, crc)
+    return size, crc
+
+@functools.lru_cache(maxsize=4)
+def _read_factors(path: str, fingerprint: tuple[int, int]) -> pd.DataFrame:
+    # fingerprint is only part of the cache key: rewriting the file with the same
+    # contents (e.g. a re-run import) still hits, changed contents miss
+    if path.endswith(".parquet"):
+        df = _read_parquet(path)
+        _check_schema(df)
+        return df
+
+    # CSVs get a validated Parquet sibling tagged with the CSV's fingerprint; it is only reused
+    # when the tag matches, so replaced contents miss even if the CSV's mtime went backwards
+    cache = path + ".parquet"
+    tag = "%d:%08x" % fingerprint
+    if os.path.exists(cache):
+        try:
+            cached = _read_parquet(cache)
+        except (OSError, ImportError, ValueError):
+            cached = None  # unreadable cache: fall through and rebuild it
+        if cached is not None and cached.attrs.get("csv_fingerprint") == tag:
+            cached.attrs = {}
+            return cached
+
+    df = pd.read_csv(path, dtype=FACTOR_DTYPES)
+    _check_schema(df)
+    df.attrs["csv_fingerprint"] = tag  # stored in the Parquet metadata
+    try:
+        df.to_parquet(cache, index=False)
+    except (OSError, ImportError):
+        pass  # read-only dir or no parquet engine: the cache is optional
+    finally:
+        df.attrs = {}
+    return df
 
 def load_nba_team_factors(base_dir: str = "./data", max_age_days: int = 3) -> pd.DataFrame:
     """
     Loads team factors produced by import_craftednba.py.
     Priority:
-      1) processed/nba_team_factors_current.csv
-      2) latest processed/nba_team_factors_YYYYMMDD.csv
+      1) processed/nba_team_factors_current.parquet
+      2) processed/nba_team_factors_current.csv
+      3) newest processed/nba_team_factors_YYYYMMDD.{parquet,csv} (Parquet on a same-day tie)
+    Parquet entries are skipped when no parquet engine (pyarrow) is installed.
+    CSVs are memoized to a "<name>.csv.parquet" sibling, reused while the CSV's size+CRC-32 match.
     Warn if data older than max_age_days.
+    For top-k views use df.nlargest/df.nsmallest rather than sort_values(...).head().
     """
     proc_dir = os.path.join(base_dir, "processed")
-    current = os.path.join(proc_dir, "nba_team_factors_current.csv")
-    path = current if os.path.exists(current) else _latest_snapshot(proc_dir)
+    currents = [os.path.join(proc_dir, f"nba_team_factors_current.{ext}") for ext in _formats()]
+    path = next((p for p in currents if os.path.exists(p)), None) or _latest_snapshot(proc_dir)
     if not path:
         raise FileNotFoundError("No team factors found. Run import_craftednba.py first.")
 
-    df = pd.read_csv(path)
+    # cached per (path, content fingerprint) and schema-checked on read; copy so callers can't mutate the cached frame
+    st = os.stat(path)
+    df = _read_factors(path, _fingerprint(path, (st.st_mtime_ns, st.st_size, st.st_ino))).copy()
 
     # staleness check
-    stamp = None
-    if path.endswith("current.csv"):
-        snap = _latest_snapshot(proc_dir)
-        if snap:
-            stamp = snap.split("_")[-1].split(".")[0]  # YYYYMMDD
-    else:
-        stamp = path.split("_")[-1].split(".")[0]  # YYYYMMDD
+    snap = _latest_snapshot(proc_dir) if path in currents else path
+    stamp = _snapshot_stamp(snap) if snap else None
 
     if stamp and stamp.isdigit():
-        y, m, d = int(stamp[:4]), int(stamp[4:6]), int(stamp[6:])
-        age = (dt.date.today() - dt.date(y, m, d)).days
+        age = _age_days(stamp)
         if age > max_age_days:
             import warnings
             warnings.warn(
@@ -45,15 +137,4 @@ def load_nba_team_factors(base_dir: str = "./data", max_age_days: int = 3) -> pd
                 StaleDataWarning
             )
 
-    # minimal schema assertion (case-insensitive)
-    req = {
-        "team","ortg","drtg","netrtg",
-        "off_efg","off_orb","off_tov","off_ftar",
-        "def_efg","def_orb","def_tov","def_ftar"
-    }
-    have = {c.lower() for c in df.columns}
-    missing = req - have
-    if missing:
-        raise ValueError(f"Missing required columns: {missing}")
-
     return df
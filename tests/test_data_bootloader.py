@@ -0,0 +1,105 @@
+import os, sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src", "src"))
+import data_bootloader as boot  # noqa: E402
+
+FACTORS = pd.DataFrame({
+    "team_name": ["Golden State Warriors", "Phoenix Suns"],
+    "team": ["GSW", "PHX"],
+    "ortg": [115.5, 113.0], "drtg": [112.0, 114.2], "netrtg": [3.5, -1.2],
+    "off_efg": [0.567, 0.551], "off_orb": [0.273, 0.25], "off_tov": [0.167, 0.148], "off_ftar": [0.285, 0.259],
+    "def_efg": [0.546, 0.55], "def_orb": [0.296, 0.26], "def_tov": [0.154, 0.138], "def_ftar": [0.236, 0.224],
+    "source": ["CraftedNBA", "CraftedNBA"],
+})
+
+def test_latest_snapshot_prefers_newest_stamp_over_format(tmp_path):
+    pytest.importorskip("pyarrow")
+    FACTORS.to_parquet(tmp_path / "nba_team_factors_20261001.parquet", index=False)
+    FACTORS.to_csv(tmp_path / "nba_team_factors_20261014.csv", index=False)
+    (tmp_path / "nba_team_factors_20261020.csv.parquet").touch()  # loader cache, not a snapshot
+    assert boot._latest_snapshot(str(tmp_path)).endswith("nba_team_factors_20261014.csv")
+
+    FACTORS.to_parquet(tmp_path / "nba_team_factors_20261014.parquet", index=False)
+    assert boot._latest_snapshot(str(tmp_path)).endswith("nba_team_factors_20261014.parquet")
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    boot._fingerprint.cache_clear()
+    boot._read_factors.cache_clear()
+    yield
+    boot._fingerprint.cache_clear()
+    boot._read_factors.cache_clear()
+
+@pytest.fixture
+def csv_reads(monkeypatch):
+    """Count how often the loader actually parses a CSV."""
+    calls = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(boot.pd, "read_csv", lambda *a, **k: calls.append(a[0]) or read_csv(*a, **k))
+    return calls
+
+def _write_current(base, df):
+    proc = base / "processed"
+    proc.mkdir(exist_ok=True)
+    path = proc / "nba_team_factors_current.csv"
+    df.to_csv(path, index=False)
+    return path
+
+def _load(base):
+    return boot.load_nba_team_factors(str(base))
+
+def test_returned_frame_is_a_copy(tmp_path):
+    _write_current(tmp_path, FACTORS)
+    df = _load(tmp_path)
+    df.loc[:, "ortg"] = 0.0
+    assert _load(tmp_path)["ortg"].tolist() == pytest.approx([115.5, 113.0])
+
+def test_identical_rewrite_hits_in_memory_cache(tmp_path, csv_reads):
+    path = _write_current(tmp_path, FACTORS)
+    _load(tmp_path)
+    st = os.stat(path)
+    _write_current(tmp_path, FACTORS)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    _load(tmp_path)
+    assert len(csv_reads) == 1
+
+def test_replaced_contents_miss_even_with_restored_mtime(tmp_path):
+    path = _write_current(tmp_path, FACTORS)
+    _load(tmp_path)
+    st = os.stat(path)
+
+    # same size, same mtime, new inode: what `cp -p` / `rsync -t` produce
+    changed = FACTORS.assign(ortg=[116.5, 113.0])
+    tmp = tmp_path / "processed" / "incoming.tmp"
+    changed.to_csv(tmp, index=False)
+    assert tmp.stat().st_size == st.st_size
+    os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp, path)
+
+    assert _load(tmp_path)["ortg"].tolist() == pytest.approx([116.5, 113.0])
+
+def test_parquet_sibling_reused_across_processes(tmp_path, csv_reads):
+    pytest.importorskip("pyarrow")
+    path = _write_current(tmp_path, FACTORS)
+    first = _load(tmp_path)
+    assert os.path.exists(f"{path}.parquet")
+
+    boot._fingerprint.cache_clear()
+    boot._read_factors.cache_clear()  # as in a fresh process
+    assert _load(tmp_path).equals(first)
+    assert len(csv_reads) == 1
+
+def test_parquet_sibling_with_mismatched_tag_is_rejected(tmp_path, csv_reads):
+    pytest.importorskip("pyarrow")
+    path = _write_current(tmp_path, FACTORS)
+    stale = FACTORS.assign(ortg=[90.0, 90.0])
+    stale.attrs["csv_fingerprint"] = "0:00000000"
+    stale.to_parquet(f"{path}.parquet", index=False)
+
+    assert _load(tmp_path)["ortg"].tolist() == pytest.approx([115.5, 113.0])
+    assert len(csv_reads) == 1
+    # the rejected sibling is rewritten with the CSV's real tag
+    assert pd.read_parquet(f"{path}.parquet").attrs["csv_fingerprint"] != "0:00000000"
@@ -0,0 +1,71 @@
+import os, sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+import import_craftednba as imp  # noqa: E402
+
+# percents (first 6 columns) and FTAr ratios (last 2): in-range, out-of-range, negatives and NaN
+RAW = np.array([
+    [np.nan, -5.0, 0.5, 150.0, 2.0, 1.2, 300.0, 1.6],
+    [0.3, -0.5, 1.4, 99.0, 0.0, 0.0, -1.0, np.nan],
+    [1.5, 1.6, 56.7, 0.0, 100.0, 250.0, 1.5, 28.5],
+])
+
+def test_norm_block_loop_matches_numpy():
+    expected = imp._norm_block_np(RAW, 6)
+    assert np.array_equal(imp._norm_block_loop(RAW, 6), expected, equal_nan=True)
+
+def test_norm_block_jit_matches_numpy():
+    pytest.importorskip("numba")
+    kernel = imp._jit_norm_block()
+    assert np.array_equal(kernel(RAW, 6), imp._norm_block_np(RAW, 6), equal_nan=True)
+
+def test_norm_block_small_input_skips_numba(monkeypatch):
+    monkeypatch.setattr(imp, "_jit_norm_block", lambda: pytest.fail("numba path used below NUMBA_MIN_ROWS"))
+    assert np.array_equal(imp._norm_block(RAW, 6), imp._norm_block_np(RAW, 6), equal_nan=True)
+
+HEADER = "Team,ORTG,DRTG,NetRTG,Off eFG%,Off ORB%,Off FTAr,Off TOV%,Def EFG%,Def ORB%,Def FTAr,Def TOV%\n"
+
+def _write(tmp_path, name, rows):
+    path = tmp_path / name
+    path.write_text(HEADER + "".join(r + "\n" for r in rows))
+    return str(path)
+
+def test_plain_number_columns_take_numeric_path(tmp_path, monkeypatch):
+    path = _write(tmp_path, "numbers.csv", [
+        "Golden State Warriors,115.5,112.0,3.5,56.7,27.3,28.5,16.7,54.6,29.6,23.6,15.4",
+        "Phoenix Suns,113.0,114.2,-1.2,55.1,25.0,25.9,14.8,55.0,26.0,22.4,13.8",
+    ])
+    seen = []
+    to_number = imp._to_number
+    monkeypatch.setattr(imp, "_to_number", lambda s: seen.append(s.dtype.kind) or to_number(s))
+    imp.load_and_normalize(path)
+    assert seen == ["f"] * 8
+
+def test_percent_strings_match_plain_numbers(tmp_path):
+    numbers = _write(tmp_path, "numbers.csv", [
+        "Golden State Warriors,115.5,112.0,3.5,56.7,27.3,28.5,16.7,54.6,29.6,23.6,15.4",
+    ])
+    percents = _write(tmp_path, "percents.csv", [
+        "Golden State Warriors,115.5,112.0,3.5,56.7%,27.3%,28.5,16.7%,54.6%,29.6%,23.6,15.4%",
+    ])
+    assert imp.load_and_normalize(numbers).equals(imp.load_and_normalize(percents))
+
+def test_unparseable_ratings_become_nan(tmp_path):
+    path = _write(tmp_path, "dash.csv", [
+        "Golden State Warriors,—,112.0,3.5,56.7,27.3,28.5,16.7,54.6,29.6,23.6,15.4",
+    ])
+    out = imp.load_and_normalize(path)
+    assert np.isnan(out.loc[0, "ortg"]) and out.loc[0, "drtg"] == np.float32(112.0)
+
+@pytest.mark.parametrize("chunksize", [None, 7])
+def test_output_rows_sorted_by_team(tmp_path, chunksize):
+    # every franchise, in full-name order (Boston before Brooklyn, but BKN sorts before BOS)
+    names = [n for n in imp.TEAM_ABBR if n != "LA Clippers"]
+    path = _write(tmp_path, "all.csv", [f"{n},110,111,-1,55,25,25,14,55,26,22,13" for n in names])
+    df = imp.load_and_normalize(path, chunksize=chunksize)
+    assert list(df["team"].cat.categories) == sorted(df["team"].cat.categories)
+    df_out = imp.sort_by_team(df)
+    assert list(df_out["team"]) == sorted(set(imp.TEAM_ABBR.values()))